@@ -0,0 +1,505 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import time
+import os
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+from excel_io import connect_to_excel, excel_fast, read_range_fast, read_sheet
+
+# -----------------------------------------------------------------------------
+# CONFIGURATION
+# -----------------------------------------------------------------------------
+# --- PASTE YOUR FULL PATH HERE (keep the r before the quotes) ---
+FILE_PATH = r"C:\Users\c.charukant\Downloads\Live_DAP.xlsx"
+FILE_NAME_ONLY = "Live_DAP.xlsx"
+
+SHEET_MAIN = "DAP_Main"
+SHEET_PROFIT = "Profit"
+
+# --- OPTIONAL: CSV snapshot written by the excel/DapExport.bas macro ---
+# While the macro keeps this file fresh, DAP_Main is read from it instead of over COM.
+EXPORT_PATH = r"C:\dap\dap_main.csv"
+EXPORT_MAX_AGE = 10 # seconds; an older snapshot means the macro stopped
+
+# -----------------------------------------------------------------------------
+# HYBRID DATA LOADER
+# -----------------------------------------------------------------------------
+def load_data():
+    """
+    1. Tries to connect to an OPEN Excel workbook via xlwings (Live Mode).
+    2. If not found/Linux, tries to read the file from disk using pandas (Static Mode).
+    """
+    # CASE 1: Try Live Connection (Windows/Mac only)
+    try:
+        book, msg = connect_to_excel(FILE_NAME_ONLY, FILE_PATH)
+        try:
+            book.name
+        except:
+            # Workbook was closed since the handle was cached, search again
+            connect_to_excel.clear()
+            book, msg = connect_to_excel(FILE_NAME_ONLY, FILE_PATH)
+        return book, msg, True
+    except LookupError:
+        pass
+
+    # CASE 2: Static Fallback (Pandas)
+    # If we are here, we couldn't connect live. Let's try reading the file from disk.
+    if os.path.exists(FILE_PATH):
+        return None, f"Static Mode (Reading from Disk): {FILE_PATH}", False
+    else:
+        return None, f"FILE NOT FOUND at: {FILE_PATH}", False
+
+
+@st.cache_data(ttl=5, max_entries=4, show_spinner=False)
+def _load_static(path, mtime):
+    """
+    Reads and parses the DAP_Main grid (A1:AZ300) from disk (Static Mode).
+    `mtime` is only used as part of the cache key, so a saved file invalidates the cache.
+    """
+    return _market(read_sheet(path, SHEET_MAIN, 300, 52))
+
+
+class Cols(NamedTuple):
+    """0-based column indices of the Outright / Spread / Fly blocks in DAP_Main."""
+    out_name: int
+    out_last: int
+    out_tv: int
+    spd_name: int
+    spd_last: int
+    fly_name: int
+    fly_last: int
+
+
+# Every keyword the column rules look for, matched in a single pass per header
+_HEADER_TOKENS = re.compile(r"outright|symbol|tick value|spread|fly|last|price|ltp")
+
+
+@lru_cache(maxsize=8)
+def resolve_cols(headers):
+    """
+    Maps the DAP_Main header row to a Cols of column indices.
+    Memoized on the header tuple since the layout rarely changes between reruns.
+    """
+    # --- MAP COLUMNS ---
+    # We search for column indices dynamically based on header names
+    cols = {
+        'out_name': -1, 'out_last': -1, 'out_tv': -1,
+        'spd_name': -1, 'spd_last': -1,
+        'fly_name': -1, 'fly_last': -1
+    }
+
+    for idx, h in enumerate(headers):
+        # One scan per header; rules below are then set lookups
+        found = set(_HEADER_TOKENS.findall(h.lower()))
+        # Outrights (Left)
+        if idx < 10:
+            if found & {'outright', 'symbol'}: cols['out_name'] = idx
+            if found & {'last', 'price'} and cols['out_last'] == -1: cols['out_last'] = idx
+        
+        if idx < 15 and 'tick value' in found: cols['out_tv'] = idx
+        
+        # Spreads (Middle)
+        if idx > 10 and idx < 20:
+            if 'spread' in found and cols['spd_name'] == -1: cols['spd_name'] = idx
+        
+        if idx > 10 and idx < 25:
+            if found & {'last', 'ltp'} and cols['spd_last'] == -1 and idx > cols['spd_name']: 
+                cols['spd_last'] = idx
+
+        # Flies (Right)
+        if idx > 20:
+            if 'fly' in found and cols['fly_name'] == -1: cols['fly_name'] = idx
+            if found & {'last', 'ltp'} and cols['fly_last'] == -1 and idx > cols['fly_name']:
+                cols['fly_last'] = idx
+
+    # Fallbacks (Hardcoded based on your CSV snippet if dynamic fails)
+    if cols['out_name'] == -1: cols['out_name'] = 1  # Column B
+    if cols['out_last'] == -1: cols['out_last'] = 3  # Column D
+    if cols['out_tv'] == -1: cols['out_tv'] = 14     # Column O (roughly)
+    
+    if cols['spd_name'] == -1: cols['spd_name'] = 13 # Column N
+    if cols['spd_last'] == -1: cols['spd_last'] = 14 # Column O
+    
+    if cols['fly_name'] == -1: cols['fly_name'] = 25 # Column Z
+    if cols['fly_last'] == -1: cols['fly_last'] = 26 # Column AA
+
+    return Cols(**cols)
+
+
+def valid_names(s):
+    """Mask of cells holding a real instrument name (not empty / NaN / None)."""
+    as_str = s.astype(str)
+    return s.notna() & as_str.str.strip().ne('') & ~as_str.str.lower().isin(('nan', 'none'))
+
+
+def _to_float(values):
+    """Coerces an array of raw cells to float64, anything unparseable -> 0.0."""
+    out = pd.to_numeric(values, errors='coerce').astype(float)
+    return np.where(np.isnan(out), 0.0, out)
+
+
+def _parse(df_raw):
+    """
+    Turns the raw DAP_Main grid into the market DataFrame.
+    Not cached itself: the loaders that call it are, keyed on the source (path+mtime / token).
+    """
+    # --- FIND HEADERS ---
+    # Locate the row containing "Outrights" or "Spread"
+    mask = df_raw.iloc[:15].astype(str).isin(["Outrights", "Spread"]).any(axis=1)
+    header_row_idx = int(mask.values.argmax()) if mask.any() else -1
+    
+    if header_row_idx == -1:
+        return pd.DataFrame(), "Could not find 'Outrights' header row."
+
+    # Get Headers
+    headers = [str(x).strip() for x in df_raw.iloc[header_row_idx].values]
+    cols = resolve_cols(tuple(headers))
+
+    # Plain ndarray from here on: slicing is C indexing, no iloc/Series per block
+    data_rows = df_raw.to_numpy(dtype=object)[header_row_idx+1:]
+
+    def build(idxs, typ):
+        # Slice the block's columns once; transposed so each column is a contiguous array
+        block = np.ascontiguousarray(data_rows[:, list(idxs)].T)
+        names = pd.Series(block[0])
+        mask = valid_names(names).to_numpy()
+        prices = _to_float(block[1])
+        if len(idxs) > 2:
+            tvs = _to_float(block[2])[mask]
+            tvs = np.where(tvs != 0, tvs, 100.0) # Blank/unparseable tick value -> standard
+        else:
+            tvs = 100.0 # Standard logic
+        return pd.DataFrame({
+            "Instrument": names[mask].astype(str).to_numpy(), "Type": typ,
+            "Price": prices[mask], "TickValue": tvs
+        })
+
+    df_market = pd.concat([
+        build((cols.out_name, cols.out_last, cols.out_tv), "Outright"),  # 1. OUTRIGHTS
+        build((cols.spd_name, cols.spd_last), "Spread"),                 # 2. SPREADS
+        build((cols.fly_name, cols.fly_last), "Fly"),                    # 3. FLIES
+    ], ignore_index=True)
+
+    # Low-cardinality labels: category makes ==/unique() work on integer codes
+    df_market['Instrument'] = df_market['Instrument'].astype('category')
+    df_market['Type'] = df_market['Type'].astype('category')
+    # Dashboard precision: float32 halves the numeric columns
+    df_market = df_market.astype({'Price': 'float32', 'TickValue': 'float32'})
+
+    return df_market, "Success"
+
+
+def lookup_maps(df_market):
+    """
+    Instrument -> Price / TickValue / Type dicts (first row wins, like the old .iloc[0]).
+    """
+    if df_market.empty:
+        return {}, {}, {}
+    first = df_market.drop_duplicates('Instrument')
+    price_map = dict(zip(first['Instrument'], first['Price']))
+    tv_map = dict(zip(first['Instrument'], first['TickValue']))
+    type_map = dict(zip(first['Instrument'], first['Type']))
+    return price_map, tv_map, type_map
+
+
+def _market(df_raw):
+    """
+    _parse plus the lookup dicts, so each cached loader builds both once per source version.
+    """
+    df_market, msg = _parse(df_raw)
+    return df_market, msg, lookup_maps(df_market)
+
+
+@st.cache_data(ttl=2, max_entries=4, show_spinner=False)
+def _load_live(_sheet, book_name, token):
+    """
+    Reads and parses the DAP_Main grid (A1:AZ300) from the open workbook (Live Mode).
+    `_sheet` is not hashed; `book_name` + `token` decide when Excel is actually re-read.
+    """
+    with excel_fast(_sheet.book.app):
+        # Only pull rows Excel actually uses (every empty cell still crosses COM)
+        max_row = min(300, _sheet.used_range.last_cell.row)
+        raw = read_range_fast(_sheet, f'A1:AZ{max_row}')
+    return _market(pd.DataFrame(raw))
+
+
+@st.cache_data(ttl=EXPORT_MAX_AGE, max_entries=1, show_spinner=False)
+def _load_export(path, mtime):
+    """
+    Reads and parses the DAP_Main CSV snapshot written by excel/DapExport.bas (no header row, A:AZ).
+    `mtime` is only used as part of the cache key, so every new snapshot is read exactly once;
+    the macro rewrites it every second, so only the latest one is kept.
+    """
+    try:
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        return _market(pd.read_csv(path, header=None))
+
+    # Columnar multithreaded reader, straight into pandas
+    table = pa_csv.read_csv(path, read_options=pa_csv.ReadOptions(autogenerate_column_names=True))
+    df_raw = table.to_pandas()
+    df_raw.columns = range(df_raw.shape[1])
+    return _market(df_raw)
+
+
+def _export_mtime():
+    """
+    mtime of the CSV snapshot if it exists and is recent enough to trust, else None.
+    """
+    try:
+        mtime = os.path.getmtime(EXPORT_PATH)
+    except (OSError, TypeError):
+        return None
+    return mtime if time.time() - mtime <= EXPORT_MAX_AGE else None
+
+
+def fetch_market_data(book, is_live):
+    """
+    Parses DAP_Main from the exported CSV snapshot, the live book object or the file on disk.
+    Returns (df_market, msg, (price_map, tv_map, type_map)).
+    """
+    try:
+        export_mtime = _export_mtime()
+        if export_mtime is not None:
+            # Snapshot from the Excel-side exporter: no COM traffic at all
+            return _load_export(EXPORT_PATH, export_mtime)
+        elif is_live and book:
+            sheet = book.sheets[SHEET_MAIN]
+            # Cheap version probe: one cell plus a 2s time bucket (use "Refresh Live" to force a read)
+            token = (sheet.range('A1').value, int(time.time() // 2))
+            return _load_live(sheet, book.name, token)
+        else:
+            # Static read (cached until the file on disk changes)
+            return _load_static(FILE_PATH, os.path.getmtime(FILE_PATH))
+
+    except Exception as e:
+        return pd.DataFrame(), str(e), ({}, {}, {})
+
+
+def fetch_profit_sheet(book, is_live):
+    """
+    Reads the first 50 rows of the Profit sheet (A:Z, first row as header).
+    """
+    if is_live:
+        sheet = book.sheets[SHEET_PROFIT]
+        # Clamp A1:Z50 to the used range so empty cells never cross COM
+        last = sheet.used_range.last_cell
+        values = sheet.range((1, 1), (min(50, last.row), min(26, last.column))).options(ndim=2).value
+        return pd.DataFrame(values[1:], columns=values[0])
+    return read_sheet(FILE_PATH, SHEET_PROFIT, 50, 26, header=0)
+
+
+@st.cache_data(show_spinner=False)
+def instrument_options(instruments, types):
+    """
+    Sorted instrument tuples for the Add Trade filter, keyed by Type plus "All".
+    Takes tuples so the cache key only changes when the instrument set does (not on price ticks),
+    and returns immutable tuples so reruns hand the selectbox the cached options unchanged.
+    """
+    opts = {"All": tuple(sorted(set(instruments)))}
+    for typ in ["Spread", "Fly", "Outright"]:
+        opts[typ] = tuple(sorted({inst for inst, t in zip(instruments, types) if t == typ}))
+    return opts
+
+# -----------------------------------------------------------------------------
+# POSITIONS & TABS
+# -----------------------------------------------------------------------------
+def add_trade(inst, lots, entry, tv):
+    pid = time.time_ns()
+    # Coarse system clocks can still repeat a tick; never overwrite an open position
+    while pid in st.session_state.positions_by_id:
+        pid += 1
+    st.session_state.positions_by_id[pid] = {
+        "id": pid,
+        "Instrument": inst, "Lots": np.int32(lots), "Entry": np.float32(entry), "TV": np.float32(tv)
+    }
+    st.session_state.pop('port_df', None)
+
+
+def positions_frame():
+    """
+    Typed positions table, kept in session_state and only rebuilt when positions change,
+    so Monitor reruns/refresh ticks skip DataFrame construction and dtype inference.
+    """
+    if 'port_df' not in st.session_state:
+        vals = list(st.session_state.positions_by_id.values())
+        n = len(vals)
+        st.session_state['port_df'] = pd.DataFrame({
+            "id": np.fromiter((p['id'] for p in vals), dtype=np.int64, count=n),
+            "Instrument": pd.Series([p['Instrument'] for p in vals], dtype=object),
+            "Lots": np.fromiter((p['Lots'] for p in vals), dtype=np.int32, count=n),
+            "Entry": np.fromiter((p['Entry'] for p in vals), dtype=np.float32, count=n),
+            "TV": np.fromiter((p['TV'] for p in vals), dtype=np.float32, count=n),
+        })
+    return st.session_state['port_df']
+
+
+# Each tab body is a fragment: its widgets only rerun that tab, not the Excel load in render().
+# monitor_tab is wrapped in render() because its run_every depends on the auto-refresh toggle.
+def monitor_tab(book, is_live):
+    if not st.session_state.positions_by_id:
+        st.info("No active trades.")
+        return
+
+    # Fetch prices here (cached) so timer reruns of this fragment see new ticks
+    df_market, data_msg, maps = fetch_market_data(book, is_live)
+    if df_market.empty:
+        # A failed tick (Excel busy/closed) keeps the last good prices instead of raising
+        st.warning(f"Data Error: {data_msg}")
+        if 'last_maps' not in st.session_state:
+            return
+        maps = st.session_state['last_maps']
+    st.session_state['last_maps'] = maps
+    price_map, tv_map, _ = maps
+
+    # Vectorized PnL over all positions at once (Live/PnL columns are overwritten in place)
+    pos_df = positions_frame()
+    live = pos_df['Instrument'].map(price_map)
+    found = live.notna()
+    # Use manual TV if set, otherwise market TV
+    tv_eff = np.where(pos_df['TV'] > 0, pos_df['TV'], pos_df['Instrument'].map(tv_map))
+    pos_df['Live'] = live.fillna(0.0)
+    pos_df['PnL'] = np.where(found, (pos_df['Live'] - pos_df['Entry']) * pos_df['Lots'] * tv_eff, 0.0)
+    total_pnl = pos_df['PnL'].sum()
+
+    st.metric("Total Open PnL", f"${total_pnl:,.2f}")
+    
+    # Display Rows: one dataframe (select a row to close it), not a row of widgets per position
+    view = pos_df[['Instrument', 'Lots', 'Entry', 'Live', 'PnL']].style.format(
+        {"Entry": "{:.4f}", "Live": "{:.4f}", "PnL": "${:,.2f}"}
+    ).map(lambda v: f"color: {'green' if v >= 0 else 'red'}", subset=['PnL'])
+    event = st.dataframe(
+        view,
+        hide_index=True,
+        use_container_width=True,
+        # New key after every close, so the old row selection can't point at a different position
+        key=f"port_selection_{st.session_state.get('close_count', 0)}",
+        on_select="rerun",
+        selection_mode="single-row",
+    )
+
+    rows = [r for r in event.selection.rows if r < len(pos_df)]
+    if st.button("Close selected position", disabled=not rows):
+        st.session_state.positions_by_id.pop(int(pos_df['id'].iat[rows[0]]), None)
+        st.session_state.pop('port_df', None)
+        st.session_state['close_count'] = st.session_state.get('close_count', 0) + 1
+        st.rerun(scope="fragment")
+
+
+@st.fragment
+def add_tab(opts_by_type, price_map, tv_map, type_map):
+    st.subheader("New Trade")
+    
+    # Filter list
+    type_filter = st.radio("Filter", ["All", "Spread", "Fly", "Outright"], horizontal=True)
+    opts = opts_by_type[type_filter]
+        
+    sel_inst = st.selectbox("Instrument", opts)
+    
+    # Get Current Details
+    if sel_inst:
+        curr = {"Price": price_map[sel_inst], "TickValue": tv_map[sel_inst], "Type": type_map[sel_inst]}
+        st.caption(f"Live Price: {curr['Price']} | Type: {curr['Type']}")
+        
+        c_1, c_2 = st.columns(2)
+        lots = c_1.number_input("Lots (+ Long / - Short)", value=1, step=1)
+        # number_input only accepts builtin floats, not np.float32
+        entry = c_2.number_input("Entry Price", value=float(curr['Price']), format="%.4f")
+        tv = st.number_input("Tick Value (Optional Override)", value=float(curr['TickValue']))
+        
+        if st.button("Add Position", type="primary"):
+            add_trade(sel_inst, lots, entry, tv)
+            st.success("Added!")
+            time.sleep(0.5)
+            # Full rerun so the Monitor tab picks up the new position
+            st.rerun()
+
+
+@st.fragment
+def data_tab(df_market, book, is_live):
+    st.subheader("Parsed Market Data")
+    # Only serialize/ship the full table when asked for
+    if st.toggle("Show market table", value=False):
+        st.dataframe(df_market, use_container_width=True, height=400)
+    
+    st.subheader("Raw Excel View")
+    if st.button("Load Profit Sheet"):
+        try:
+            st.session_state['profit_df'] = fetch_profit_sheet(book, is_live)
+        except Exception as e:
+            st.error(f"Error loading profit sheet: {e}")
+
+    # Show the last load; the sheet itself is only read on click
+    if 'profit_df' in st.session_state:
+        st.dataframe(st.session_state['profit_df'])
+
+
+# -----------------------------------------------------------------------------
+# APP UI
+# -----------------------------------------------------------------------------
+def render():
+    """
+    Builds the whole page. Called once per Streamlit rerun by the entrypoint script.
+    """
+    st.set_page_config(
+        page_title="DAP Position Manager",
+        page_icon="📈",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+
+    st.title("📊 DAP Live Dashboard")
+
+    # 1. Connection
+    book, msg, is_live = load_data()
+
+    with st.sidebar:
+        st.header("Status")
+        if is_live:
+            st.success(f"🟢 {msg}")
+            if st.button("🔄 Refresh Live"):
+                _load_live.clear()
+                st.rerun()
+            if st.button("🔌 Reconnect"):
+                connect_to_excel.clear()
+                st.rerun()
+        else:
+            # If static, allow refresh from disk
+            st.warning(f"🟠 {msg}")
+            if "FILE NOT FOUND" in msg:
+                st.error("Please check the FILE_PATH in the code.")
+            else:
+                if st.button("📂 Reload File from Disk"):
+                    st.cache_data.clear()
+                    st.rerun()
+
+        # Timer-driven rerun of the Monitor tab only (sidebar/other tabs are not redrawn)
+        auto_refresh = st.toggle("Auto-refresh PnL (5s)", value=False)
+
+    # 2. Data Load
+    df_market, data_msg, (price_map, tv_map, type_map) = fetch_market_data(book, is_live)
+
+    if df_market.empty:
+        st.error(f"Data Error: {data_msg}")
+        st.stop()
+
+    opts_by_type = instrument_options(tuple(df_market['Instrument']), tuple(df_market['Type']))
+
+    # 3. Positions (Session State), keyed by id so deletes are O(1); dicts keep insertion order
+    if 'positions_by_id' not in st.session_state:
+        st.session_state.positions_by_id = {}
+
+    # 4. Tabs
+    t1, t2, t3 = st.tabs(["Monitor", "Add Trade", "Data View"])
+
+    with t1:
+        st.fragment(run_every=5 if auto_refresh else None)(monitor_tab)(book, is_live)
+
+    with t2:
+        add_tab(opts_by_type, price_map, tv_map, type_map)
+
+    with t3:
+        data_tab(df_market, book, is_live)
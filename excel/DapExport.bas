@@ -0,0 +1,122 @@
+Attribute VB_Name = "DapExport"
+' -----------------------------------------------------------------------------
+' DAP_Main snapshot exporter for the Streamlit dashboard.
+' A .xlsx workbook cannot hold VBA, so import this module into one of:
+'   - the Personal Macro Workbook (PERSONAL.XLSB; record any macro with
+'     "Store macro in: Personal Macro Workbook" once to create it). Live_DAP
+'     stays a .xlsx and no dashboard settings change. Or
+'   - a macro-enabled copy saved as Live_DAP.xlsm. Update FILE_PATH in
+'     dap_core.py to the .xlsm; the open-book match ignores the extension.
+' (Developer > Visual Basic > File > Import File), then run StartDapExport.
+' Every EXPORT_SECONDS it writes A1:AZ300 of DAP_Main in the open SOURCE_BOOK
+' to EXPORT_PATH as CSV, so the dashboard can read the file instead of pulling
+' the range over COM. Run StopDapExport to stop.
+' The folder of EXPORT_PATH is created on first use (one level only).
+' A tick that can't export (book closed, folder missing, CSV locked by the
+' dashboard's reader) is skipped silently and retried on the next one, so
+' no error dialog ever blocks Excel or the dashboard's COM fallback.
+' Keep EXPORT_PATH in sync with EXPORT_PATH in dap_core.py.
+' -----------------------------------------------------------------------------
+Option Explicit
+
+Private Const EXPORT_PATH As String = "C:\dap\dap_main.csv"
+Private Const SOURCE_BOOK As String = "Live_DAP" ' workbook name without extension
+Private Const EXPORT_SECONDS As Long = 1
+Private Const MAX_ROWS As Long = 300
+Private Const MAX_COLS As Long = 52 ' A:AZ
+
+Private NextRun As Date
+
+Public Sub StartDapExport()
+    ' Schedule the next tick first, so a failed export can never stop the loop
+    NextRun = Now + TimeSerial(0, 0, EXPORT_SECONDS)
+    Application.OnTime NextRun, "StartDapExport"
+    ExportDapMain
+End Sub
+
+Public Sub StopDapExport()
+    On Error Resume Next
+    Application.OnTime NextRun, "StartDapExport", , False
+End Sub
+
+Public Sub ExportDapMain()
+    Dim ws As Worksheet, vals As Variant
+    Dim nRows As Long, r As Long, c As Long
+    Dim line As String, tmpPath As String, f As Integer, wb As Workbook
+
+    On Error GoTo SkipTick
+    Set wb = SourceBook()
+    If wb Is Nothing Then Exit Sub ' Live_DAP not open
+    Set ws = wb.Worksheets("DAP_Main")
+    nRows = ws.UsedRange.Row + ws.UsedRange.Rows.Count - 1
+    If nRows > MAX_ROWS Then nRows = MAX_ROWS
+    If nRows < 1 Then Exit Sub
+
+    ' One bulk read of raw values (Value2: no date/currency coercion)
+    vals = ws.Range(ws.Cells(1, 1), ws.Cells(nRows, MAX_COLS)).Value2
+
+    ' Write to a temp file and swap it in, so the dashboard never reads a half-written file
+    tmpPath = EXPORT_PATH & ".tmp"
+    EnsureFolder EXPORT_PATH
+    f = FreeFile
+    Open tmpPath For Output As #f
+    For r = 1 To nRows
+        line = ""
+        For c = 1 To MAX_COLS
+            If c > 1 Then line = line & ","
+            line = line & CsvField(vals(r, c))
+        Next c
+        Print #f, line
+    Next r
+    Close #f
+    f = 0
+
+    ' Kill fails while the dashboard has the CSV open; keep the old snapshot and retry next tick
+    If Not TryKill(EXPORT_PATH) Then GoTo SkipTick
+    Name tmpPath As EXPORT_PATH
+    Exit Sub
+
+SkipTick:
+    ' Clear the active error first, or errors in this cleanup would still raise
+    On Error GoTo -1
+    On Error Resume Next
+    If f <> 0 Then Close #f
+    If Len(tmpPath) > 0 Then Kill tmpPath
+End Sub
+
+' True if path is gone afterwards (deleted, or never existed).
+Private Function TryKill(path As String) As Boolean
+    On Error Resume Next
+    If Len(Dir$(path)) > 0 Then Kill path
+    TryKill = (Len(Dir$(path)) = 0)
+End Function
+
+' Creates the folder that holds path if it doesn't exist yet.
+Private Sub EnsureFolder(path As String)
+    Dim folder As String
+    folder = Left$(path, InStrRev(path, "\") - 1)
+    If Len(Dir$(folder, vbDirectory)) = 0 Then MkDir folder
+End Sub
+
+' The open workbook named SOURCE_BOOK (any extension); Nothing if it isn't open.
+' Looked up by name because from PERSONAL.XLSB, ThisWorkbook is the personal workbook itself.
+Private Function SourceBook() As Workbook
+    Dim wb As Workbook
+    For Each wb In Application.Workbooks
+        If LCase$(wb.Name) Like LCase$(SOURCE_BOOK) & ".xls*" Then
+            Set SourceBook = wb
+            Exit Function
+        End If
+    Next wb
+End Function
+
+Private Function CsvField(v As Variant) As String
+    If IsError(v) Or IsEmpty(v) Then
+        CsvField = ""
+    ElseIf VarType(v) = vbString Then
+        CsvField = """" & Replace(v, """", """""") & """"
+    Else
+        ' Str() always uses "." as the decimal separator, regardless of locale
+        CsvField = Trim$(Str$(v))
+    End If
+End Function
@@ -0,0 +1,156 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import os
+import threading
+from contextlib import contextmanager
+
+# -----------------------------------------------------------------------------
+# EXCEL I/O (shared by the dashboard; no Streamlit UI in here)
+# -----------------------------------------------------------------------------
+@st.cache_resource(show_spinner=False)
+def connect_to_excel(file_name, file_path):
+    """
+    Finds the OPEN Excel workbook via xlwings (Live Mode), by name or full path.
+    Names and paths are compared without the extension, so a .xlsm copy of the book still matches.
+    The handle is cached across reruns, so the COM app/book enumeration only runs again
+    after connect_to_excel.clear().
+    Raises LookupError when nothing matches, so a failed search is never cached.
+    """
+    status_log = []
+    name_stem = os.path.splitext(file_name)[0].lower()
+    path_stem = os.path.splitext(file_path)[0].lower()
+    
+    try:
+        import xlwings as xw
+        
+        # Method A: Check specifically for the file name in open apps
+        try:
+            book = xw.books[file_name]
+            return book, f"Connected to open file: {file_name}"
+        except:
+            status_log.append("Target file not active in xw.books")
+
+        # Method B: Loop through all open apps and check full paths
+        # This catches it if the file is open but the name is slightly different in the title bar
+        for app in xw.apps:
+            for bk in app.books:
+                # Check if the open book matches our target path or name
+                if name_stem in bk.name.lower():
+                    return bk, f"Found open book: {bk.name}"
+                try:
+                    if os.path.splitext(bk.fullname)[0].lower() == path_stem:
+                        return bk, f"Found by path: {bk.name}"
+                except:
+                    pass
+        
+        status_log.append("No matching open Excel found.")
+
+    except ImportError:
+        status_log.append("xlwings not installed.")
+    except Exception as e:
+        status_log.append(f"xlwings error: {e}")
+
+    raise LookupError("; ".join(status_log))
+
+
+# Serializes excel_fast across sessions. cache_data only locks per key, so two reads can overlap,
+# and interleaved save/restore would leave Excel stuck on manual calculation.
+_EXCEL_FAST_LOCK = threading.RLock()
+
+
+@contextmanager
+def excel_fast(app):
+    """
+    Turns off screen updating, recalculation and events in Excel for the duration of a bulk read,
+    then restores the previous settings. Does nothing where the COM Application API isn't available.
+    Only one caller at a time gets past the save step, so the settings restored are always the user's.
+    """
+    with _EXCEL_FAST_LOCK:
+        try:
+            api = app.api
+            saved = (api.ScreenUpdating, api.Calculation, api.EnableEvents)
+        except Exception:
+            saved = None
+
+        if saved is not None:
+            try:
+                api.ScreenUpdating = False
+                api.Calculation = -4135 # xlCalculationManual
+                api.EnableEvents = False
+            except Exception:
+                pass
+        try:
+            yield
+        finally:
+            if saved is not None:
+                try:
+                    api.ScreenUpdating, api.Calculation, api.EnableEvents = saved
+                except Exception:
+                    pass
+
+
+# pywin32 returns Excel error cells (#N/A, #DIV/0!, ...) in Value2 as ints: 0x800A0000 + CVErr code
+_XL_ERR_BASE = -2146828288
+
+
+def _blank_errors(raw):
+    """
+    Replaces Excel error codes in a Value2 tuple-of-tuples with None (what xlwings' .value gives).
+    Real numbers come back as floats, so only ints in the CVErr range are touched.
+    """
+    lo, hi = _XL_ERR_BASE + 2000, _XL_ERR_BASE + 2100
+    return [[None if type(v) is int and lo <= v <= hi else v for v in row] for row in raw]
+
+
+def read_range_fast(sheet, address):
+    """
+    Reads a range from a live sheet as a 2D object array in one bulk call.
+    On Windows this is the raw COM Value2 (no xlwings converters, no date/currency coercion).
+    """
+    try:
+        raw = _blank_errors(sheet.api.Range(address).Value2)
+    except Exception:
+        # Not a pywin32 sheet (e.g. Mac): lightest xlwings read, no DataFrame converter,
+        # plain floats and NaN for blanks (matches what the parser coerces to anyway)
+        raw = sheet.range(address).options(ndim=2, numbers=float, empty=np.nan).value
+    return np.asarray(raw, dtype=object)
+
+
+def read_sheet(path, sheet, nrows, max_col, header=None):
+    """
+    Reads only the top-left block of one sheet from disk, fastest engine first.
+    `nrows` counts data rows (after the header row when header=0), like pd.read_excel.
+    Sheets narrower than `max_col` come back at their own width.
+    """
+    # Fast path: calamine (Rust reader) stops at nrows inside the engine.
+    # No usecols: pandas rejects it when the sheet is narrower than the range, so slice after.
+    try:
+        df = pd.read_excel(path, sheet_name=sheet, header=header, nrows=nrows, engine="calamine")
+        return df.iloc[:, :max_col]
+    except ImportError:
+        # python-calamine not installed
+        pass
+
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        # No openpyxl, let pandas pick whatever engine it has
+        return pd.read_excel(path, sheet_name=sheet, header=header, nrows=nrows).iloc[:, :max_col]
+
+    # Read-only + values only: skips styles/formulas and only walks the block we need
+    max_row = nrows + (1 if header is not None else 0)
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet]
+        rows = list(ws.iter_rows(min_row=1, max_row=max_row, max_col=max_col, values_only=True))
+    finally:
+        wb.close()
+
+    # iter_rows pads every row out to max_col; cut back to the last column that holds anything
+    width = max((i + 1 for row in rows for i, v in enumerate(row) if v is not None), default=0)
+    rows = [row[:width] for row in rows]
+
+    if header is None:
+        return pd.DataFrame(rows)
+    return pd.DataFrame(rows[1:], columns=rows[0]).infer_objects()